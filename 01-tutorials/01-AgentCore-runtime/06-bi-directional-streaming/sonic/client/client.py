@@ -1,159 +1,286 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import os
+import secrets
 import sys
+import tempfile
+import threading
+import time
 import webbrowser
-import json
-import secrets
-import string
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
 
 # Import from root-level websocket_helpers
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from websocket_helpers import create_presigned_url
 
+# Prefer orjson for API responses (C implementation, returns bytes directly).
+# Responses are consumed by the browser client, so they are not pretty-printed.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Static error body for /api/regenerate when not using presigned URLs
+_NOT_PRESIGNED_ERROR = _dumps({
+    "status": "error",
+    "message": "Cannot regenerate URL - not using presigned URL mode"
+})
+
+
+@dataclass(frozen=True, slots=True)
+class ClientConfig:
+    """Connection settings that stay fixed for the life of the web service"""
+    session_id: str
+    runtime_arn: str | None = None
+    region: str | None = None
+    service: str | None = None
+    expires: int | None = None
+    qualifier: str | None = None
+
+
+class _UrlState:
+    """Current WebSocket URL and the responses derived from it"""
+    
+    def __init__(self, config, html_template, websocket_url, is_presigned):
+        self.lock = threading.Lock()
+        self.page_fd = None
+        self._config = config
+        self._html_template = html_template
+        self._is_presigned = is_presigned
+        self.set_url(websocket_url)
+    
+    def set_url(self, websocket_url):
+        """Store a new URL and re-render the cached page and connection info"""
+        page = None
+        if self._html_template is not None:
+            html_content = self._html_template
+            # Inject the WebSocket URL if provided
+            if websocket_url:
+                html_content = html_content.replace(
+                    'id="websocketUrl" placeholder="ws://localhost:8081/ws" value="ws://localhost:8081/ws"',
+                    f'id="websocketUrl" placeholder="ws://localhost:8081/ws" value="{websocket_url}"'
+                )
+            page = html_content.encode('utf-8')
+        
+        # Mirror the page into an unlinked temp file so it can be served with
+        # os.sendfile(); the state owns a duplicate of its descriptor, and each
+        # response sends from its own duplicate so a replaced page is never
+        # closed under an in-flight response
+        page_fd = None
+        if page is not None and hasattr(os, 'sendfile'):
+            with tempfile.TemporaryFile() as page_file:
+                page_file.write(page)
+                page_file.flush()
+                page_fd = os.dup(page_file.fileno())
+        
+        conn_json = _dumps({
+            "websocket_url": websocket_url or "ws://localhost:8081/ws",
+            "session_id": self._config.session_id,
+            "is_presigned": self._is_presigned,
+            "can_regenerate": self._config.runtime_arn is not None,
+            "status": "ok" if websocket_url else "no_connection"
+        })
+        
+        with self.lock:
+            old_page_fd = self.page_fd
+            self.websocket_url = websocket_url
+            self.generated_at = time.monotonic()
+            self.page = page
+            self.page_fd = page_fd
+            self.conn_json = conn_json
+        
+        if old_page_fd is not None:
+            os.close(old_page_fd)
+
 
 class SonicClientHandler(BaseHTTPRequestHandler):
     """HTTP request handler that serves the Nova Sonic client"""
     
-    # Class variables to store connection details
-    websocket_url = None
-    session_id = None
-    is_presigned = False
+    # Per-request access logging is opt-in (SONIC_HTTP_LOG=1); errors always log
+    _log_enabled = os.getenv('SONIC_HTTP_LOG', '').lower() in ('1', 'true', 'yes')
+    
+    # Buffer the response stream so status line, headers and body are sent
+    # together; BaseHTTPRequestHandler flushes wfile after each request
+    wbufsize = -1
     
-    # Store config for regenerating URLs
-    runtime_arn = None
-    region = None
-    service = None
-    expires = None
-    qualifier = None
+    # Route tables: request path -> handler method name (read-only, shared by all handlers)
+    _GET_ROUTES = MappingProxyType({
+        '/': 'serve_client_page',
+        '/index.html': 'serve_client_page',
+        '/api/connection': 'serve_connection_info',
+    })
+    _POST_ROUTES = MappingProxyType({
+        '/api/regenerate': 'regenerate_url',
+    })
+    
+    def __init__(self, *args, config, state, **kwargs):
+        # Set before super().__init__(), which handles the request immediately
+        self._cfg = config
+        self._state = state
+        super().__init__(*args, **kwargs)
     
     def log_message(self, format, *args):
         """Override to provide cleaner logging"""
         sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
     
+    def log_request(self, code='-', size='-'):
+        """Skip access logging unless SONIC_HTTP_LOG is enabled"""
+        if self._log_enabled:
+            super().log_request(code, size)
+    
     def do_GET(self):
         """Handle GET requests"""
-        parsed_path = urlparse(self.path)
+        handler = self._GET_ROUTES.get(self.path.partition('?')[0])
         
-        if parsed_path.path == '/' or parsed_path.path == '/index.html':
-            self.serve_client_page()
-        elif parsed_path.path == '/api/connection':
-            self.serve_connection_info()
+        if handler:
+            getattr(self, handler)()
         else:
             self.send_error(404, "File not found")
     
     def do_POST(self):
         """Handle POST requests"""
-        parsed_path = urlparse(self.path)
+        handler = self._POST_ROUTES.get(self.path.partition('?')[0])
         
-        if parsed_path.path == '/api/regenerate':
-            self.regenerate_url()
+        if handler:
+            getattr(self, handler)()
         else:
             self.send_error(404, "Endpoint not found")
     
     def serve_client_page(self):
         """Serve the HTML client with pre-configured connection"""
+        with self._state.lock:
+            page = self._state.page
+            # Duplicated under the lock so set_url cannot close it mid-send
+            page_fd = self._state.page_fd
+            if page_fd is not None:
+                page_fd = os.dup(page_fd)
+        
+        if page is None:
+            self.send_error(404, "sonic-client.html not found")
+            return
+        
         try:
-            # Read the HTML template
-            html_path = os.path.join(os.path.dirname(__file__), 'sonic-client.html')
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # Inject the WebSocket URL if provided
-            if self.websocket_url:
-                html_content = html_content.replace(
-                    'id="websocketUrl" placeholder="ws://localhost:8081/ws" value="ws://localhost:8081/ws"',
-                    f'id="websocketUrl" placeholder="ws://localhost:8081/ws" value="{self.websocket_url}"'
-                )
-            
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
-            self.send_header('Content-Length', len(html_content.encode()))
+            self.send_header('Content-Length', len(page))
             self.end_headers()
-            self.wfile.write(html_content.encode())
             
-        except FileNotFoundError:
-            self.send_error(404, "sonic-client.html not found")
-        except Exception as e:
-            self.send_error(500, f"Internal server error: {str(e)}")
+            if page_fd is None:
+                self.wfile.write(page)
+                return
+            
+            # Send the buffered headers, then let the kernel copy the page
+            self.wfile.flush()
+            out_fd = self.connection.fileno()
+            offset = 0
+            while offset < len(page):
+                sent = os.sendfile(out_fd, page_fd, offset, len(page) - offset)
+                if not sent:
+                    break
+                offset += sent
+        finally:
+            if page_fd is not None:
+                os.close(page_fd)
     
     def serve_connection_info(self):
         """Serve the connection information as JSON"""
-        response = {
-            "websocket_url": self.websocket_url or "ws://localhost:8081/ws",
-            "session_id": self.session_id,
-            "is_presigned": self.is_presigned,
-            "can_regenerate": self.runtime_arn is not None,
-            "status": "ok" if self.websocket_url else "no_connection"
-        }
-        
-        response_json = json.dumps(response, indent=2)
+        with self._state.lock:
+            payload = self._state.conn_json
         
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
-        self.send_header('Content-Length', len(response_json.encode()))
+        self.send_header('Content-Length', len(payload))
         self.end_headers()
-        self.wfile.write(response_json.encode())
+        self.wfile.write(payload)
     
     def regenerate_url(self):
         """Regenerate the presigned URL"""
+        cfg = self._cfg
         try:
-            if not self.runtime_arn:
-                error_response = {
-                    "status": "error",
-                    "message": "Cannot regenerate URL - not using presigned URL mode"
-                }
-                response_json = json.dumps(error_response)
+            if not cfg.runtime_arn:
+                payload = _NOT_PRESIGNED_ERROR
                 self.send_response(400)
                 self.send_header('Content-type', 'application/json')
-                self.send_header('Content-Length', len(response_json.encode()))
+                self.send_header('Content-Length', len(payload))
                 self.end_headers()
-                self.wfile.write(response_json.encode())
+                self.wfile.write(payload)
                 return
             
-            # Generate new presigned URL
-            base_url = f"wss://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{self.runtime_arn}/ws?qualifier={self.qualifier}"
-            
-            new_url = create_presigned_url(
-                base_url,
-                region=self.region,
-                service=self.service,
-                expires=self.expires
-            )
-            
-            # Update the class variable
-            SonicClientHandler.websocket_url = new_url
+            # Reuse the current URL while more than half of its lifetime remains
+            with self._state.lock:
+                current_url = self._state.websocket_url
+                url_age = time.monotonic() - self._state.generated_at
             
-            response = {
-                "status": "ok",
-                "websocket_url": new_url,
-                "expires_in": self.expires,
-                "message": "URL regenerated successfully"
-            }
+            if url_age < cfg.expires * 0.5:
+                response = {
+                    "status": "ok",
+                    "websocket_url": current_url,
+                    "expires_in": int(cfg.expires - url_age),
+                    "cached": True,
+                    "message": "Current URL is still valid"
+                }
+            else:
+                # Generate new presigned URL
+                base_url = f"wss://bedrock-agentcore.{cfg.region}.amazonaws.com/runtimes/{cfg.runtime_arn}/ws?qualifier={cfg.qualifier}"
+                
+                new_url = create_presigned_url(
+                    base_url,
+                    region=cfg.region,
+                    service=cfg.service,
+                    expires=cfg.expires
+                )
+                
+                self._state.set_url(new_url)
+                
+                response = {
+                    "status": "ok",
+                    "websocket_url": new_url,
+                    "expires_in": cfg.expires,
+                    "cached": False,
+                    "message": "URL regenerated successfully"
+                }
+                
+                print(f"✅ Regenerated presigned URL (expires in {cfg.expires} seconds)")
             
-            response_json = json.dumps(response, indent=2)
+            payload = _dumps(response)
             
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
-            self.send_header('Content-Length', len(response_json.encode()))
+            self.send_header('Content-Length', len(payload))
             self.end_headers()
-            self.wfile.write(response_json.encode())
-            
-            print(f"✅ Regenerated presigned URL (expires in {self.expires} seconds)")
+            self.wfile.write(payload)
             
         except Exception as e:
             error_response = {
                 "status": "error",
                 "message": str(e)
             }
-            response_json = json.dumps(error_response)
+            payload = _dumps(error_response)
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
-            self.send_header('Content-Length', len(response_json.encode()))
+            self.send_header('Content-Length', len(payload))
             self.end_headers()
-            self.wfile.write(response_json.encode())
+            self.wfile.write(payload)
+
+
+def _read_html_template():
+    """Read the client page template, or None if it is missing"""
+    html_path = os.path.join(os.path.dirname(__file__), 'sonic-client.html')
+    try:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
 
 
 def main():
@@ -246,7 +373,7 @@ Examples:
     print("=" * 70)
     
     websocket_url = None
-    session_id = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(50))
+    session_id = secrets.token_urlsafe(37)  # 50 URL-safe characters
     is_presigned = False
     
     try:
@@ -254,13 +381,16 @@ Examples:
         if args.runtime_arn:
             base_url = f"wss://bedrock-agentcore.{args.region}.amazonaws.com/runtimes/{args.runtime_arn}/ws?qualifier={args.qualifier}"
             
-            print(f"📡 Base URL: {base_url}")
-            print(f"🔑 Runtime ARN: {args.runtime_arn}")
-            print(f"🌍 Region: {args.region}")
-            print(f"🆔 Session ID: {session_id}")
-            print(f"⏰ URL expires in: {args.expires} seconds ({args.expires/60:.1f} minutes)")
-            print()
-            print("🔐 Generating pre-signed URL...")
+            sys.stdout.write(
+                f"📡 Base URL: {base_url}\n"
+                f"🔑 Runtime ARN: {args.runtime_arn}\n"
+                f"🌍 Region: {args.region}\n"
+                f"🆔 Session ID: {session_id}\n"
+                f"⏰ URL expires in: {args.expires} seconds ({args.expires/60:.1f} minutes)\n"
+                "\n"
+                "🔐 Generating pre-signed URL...\n"
+            )
+            sys.stdout.flush()
             
             websocket_url = create_presigned_url(
                 base_url,
@@ -280,39 +410,50 @@ Examples:
         print(f"🌐 Web Server Port: {args.port}")
         print()
         
-        # Set connection details in the handler class
-        SonicClientHandler.websocket_url = websocket_url
-        SonicClientHandler.session_id = session_id
-        SonicClientHandler.is_presigned = is_presigned
-        
-        # Store config for regenerating URLs
+        # Fixed connection details, plus config for regenerating URLs
         if args.runtime_arn:
-            SonicClientHandler.runtime_arn = args.runtime_arn
-            SonicClientHandler.region = args.region
-            SonicClientHandler.service = args.service
-            SonicClientHandler.expires = args.expires
-            SonicClientHandler.qualifier = args.qualifier
+            config = ClientConfig(
+                session_id=session_id,
+                runtime_arn=args.runtime_arn,
+                region=args.region,
+                service=args.service,
+                expires=args.expires,
+                qualifier=args.qualifier
+            )
+        else:
+            config = ClientConfig(session_id=session_id)
+        
+        # Render the client page and connection info once; served from memory
+        state = _UrlState(config, _read_html_template(), websocket_url, is_presigned)
         
         # Start web server
         server_address = ('', args.port)
-        httpd = HTTPServer(server_address, SonicClientHandler)
+        handler = functools.partial(SonicClientHandler, config=config, state=state)
+        httpd = ThreadingHTTPServer(server_address, handler)
         
         server_url = f"http://localhost:{args.port}"
         
-        print("=" * 70)
-        print("🌐 Web Server Started")
-        print("=" * 70)
-        print(f"📍 Server URL: {server_url}")
-        print(f"🔗 Client Page: {server_url}/")
-        print(f"📊 API Endpoint: {server_url}/api/connection")
-        print()
+        # Emit the startup banner as a single write
+        banner = [
+            "=" * 70,
+            "🌐 Web Server Started",
+            "=" * 70,
+            f"📍 Server URL: {server_url}",
+            f"🔗 Client Page: {server_url}/",
+            f"📊 API Endpoint: {server_url}/api/connection",
+            "",
+        ]
         if is_presigned:
-            print("💡 The pre-signed WebSocket URL is pre-populated in the client")
+            banner.append("💡 The pre-signed WebSocket URL is pre-populated in the client")
         else:
-            print("💡 The WebSocket URL is pre-populated in the client")
-        print("💡 Press Ctrl+C to stop the server")
-        print("=" * 70)
-        print()
+            banner.append("💡 The WebSocket URL is pre-populated in the client")
+        banner += [
+            "💡 Press Ctrl+C to stop the server",
+            "=" * 70,
+            "",
+        ]
+        sys.stdout.write("\n".join(banner) + "\n")
+        sys.stdout.flush()
         
         # Open browser automatically
         if not args.no_browser:
@@ -68,11 +68,13 @@ class StrandsClientHandler(BaseHTTPRequestHandler):
                     f'id="presignedUrl" placeholder="wss://endpoint/runtimes/arn/ws?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Credential=...&X-Amz-Signature=..." value="{self.websocket_url}"',
                 )
 
+            body = html_content.encode("utf-8")
+
             self.send_response(200)
             self.send_header("Content-type", "text/html")
-            self.send_header("Content-Length", len(html_content.encode()))
+            self.send_header("Content-Length", len(body))
             self.end_headers()
-            self.wfile.write(html_content.encode())
+            self.wfile.write(body)
 
         except FileNotFoundError:
             self.send_error(404, "strands-client.html not found")
@@ -90,12 +92,13 @@ class StrandsClientHandler(BaseHTTPRequestHandler):
         }
 
         response_json = json.dumps(response, indent=2)
+        body = response_json.encode("utf-8")
 
         self.send_response(200)
         self.send_header("Content-type", "application/json")
-        self.send_header("Content-Length", len(response_json.encode()))
+        self.send_header("Content-Length", len(body))
         self.end_headers()
-        self.wfile.write(response_json.encode())
+        self.wfile.write(body)
 
     def regenerate_url(self):
         """Regenerate the presigned URL"""
@@ -106,11 +109,12 @@ class StrandsClientHandler(BaseHTTPRequestHandler):
                     "message": "Cannot regenerate URL - not using presigned URL mode",
                 }
                 response_json = json.dumps(error_response)
+                body = response_json.encode("utf-8")
                 self.send_response(400)
                 self.send_header("Content-type", "application/json")
-                self.send_header("Content-Length", len(response_json.encode()))
+                self.send_header("Content-Length", len(body))
                 self.end_headers()
-                self.wfile.write(response_json.encode())
+                self.wfile.write(body)
                 return
 
             # Generate new presigned URL
@@ -131,23 +135,25 @@ class StrandsClientHandler(BaseHTTPRequestHandler):
             }
 
             response_json = json.dumps(response, indent=2)
+            body = response_json.encode("utf-8")
 
             self.send_response(200)
             self.send_header("Content-type", "application/json")
-            self.send_header("Content-Length", len(response_json.encode()))
+            self.send_header("Content-Length", len(body))
             self.end_headers()
-            self.wfile.write(response_json.encode())
+            self.wfile.write(body)
 
             print(f"✅ Regenerated presigned URL (expires in {self.expires} seconds)")
 
         except Exception as e:
             error_response = {"status": "error", "message": str(e)}
             response_json = json.dumps(error_response)
+            body = response_json.encode("utf-8")
             self.send_response(500)
             self.send_header("Content-type", "application/json")
-            self.send_header("Content-Length", len(response_json.encode()))
+            self.send_header("Content-Length", len(body))
             self.end_headers()
-            self.wfile.write(response_json.encode())
+            self.wfile.write(body)
 
 
 def main():
@@ -5,34 +5,191 @@ This module provides a span processor that correctly converts Strands telemetry
 to OpenInference format, updated for the new OpenTelemetry GenAI semantic conventions.
 """
 
+import functools
 import json
 import logging
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
-from datetime import datetime
 
 from opentelemetry.sdk.trace import SpanProcessor
 from opentelemetry.trace import Span
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson (C extension) for the JSON work done on every span end.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception type.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # orjson rejects integers wider than 64 bits, which json accepts
+            return json.dumps(obj, separators=(",", ":"), default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    _loads = json.loads
+
+# Strands token usage attribute -> OpenInference attribute
+_TOKEN_MAP = (
+    ("gen_ai.usage.prompt_tokens", "llm.token_count.prompt"),
+    ("gen_ai.usage.input_tokens", "llm.token_count.prompt"),  # Alternative name
+    ("gen_ai.usage.completion_tokens", "llm.token_count.completion"),
+    ("gen_ai.usage.output_tokens", "llm.token_count.completion"),  # Alternative name
+    ("gen_ai.usage.total_tokens", "llm.token_count.total"),
+)
+
+# Message keys and roles shared by every parsed message, interned once so dict
+# lookups and role comparisons can match on identity
+_K_ROLE = sys.intern("message.role")
+_K_CONTENT = sys.intern("message.content")
+_K_TOOL_CALLS = sys.intern("message.tool_calls")
+_K_TOOL_CALL_ID = sys.intern("message.tool_call_id")
+_K_FINISH_REASON = sys.intern("message.finish_reason")
+_ROLE_USER = sys.intern("user")
+_ROLE_ASSISTANT = sys.intern("assistant")
+_ROLE_TOOL = sys.intern("tool")
+
+# Clean (un-prefixed) names for the message keys produced by the parsers
+_MSG_KEY_CLEAN = {
+    key: sys.intern(key.removeprefix("message."))
+    for key in (_K_ROLE, _K_CONTENT, _K_TOOL_CALLS, _K_TOOL_CALL_ID, _K_FINISH_REASON)
+}
+
+# Exact types _serialize_value passes through unchanged
+_FAST_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Source attributes that are mapped elsewhere and never copied into metadata
+_METADATA_SKIP = frozenset({"gen_ai.prompt", "gen_ai.completion", "gen_ai.agent.tools", "agent.tools"})
+
+# Alias groups for attributes that current and legacy Strands versions name differently
+_AGENT_NAME_KEYS = ("gen_ai.agent.name", "agent.name")
+_AGENT_TOOLS_KEYS = ("gen_ai.agent.tools", "agent.tools")
+
+# Span kinds for current Strands span names: exact names, then name prefixes
+_EXACT_SPAN_KINDS = MappingProxyType({
+    "chat": "LLM",
+    "execute_event_loop_cycle": "CHAIN",
+})
+_PREFIX_SPAN_KINDS = (
+    ("execute_tool ", "TOOL"),
+    ("invoke_agent", "AGENT"),
+)
+_SPAN_KIND_PREFIXES = tuple(prefix for prefix, _ in _PREFIX_SPAN_KINDS)
+
+
+def _first(attrs: dict[str, Any], keys: tuple) -> Any:
+    """Return the first truthy value among the given alias keys, or None."""
+    for key in keys:
+        value = attrs.get(key)
+        if value:
+            return value
+    return None
+
+
+def _cycle_id(cycle_entry: dict[str, Any]) -> Any:
+    """Return a cycle span's id from its live attributes, or the value stamped when it ended."""
+    # Live mapping first: _process_span stamps the id before removing the key
+    cycle_id = cycle_entry['cycle_attributes'].get("event_loop.cycle_id")
+    return cycle_id if cycle_id is not None else cycle_entry['cycle_id']
+
+
+@functools.lru_cache(maxsize=256)
+def _base_attrs(span_kind: str, model_id: Any, has_agent: bool) -> tuple:
+    """Return the invariant OpenInference attributes for a span as (key, value) pairs."""
+    base = [("openinference.span.kind", span_kind)]
+    if model_id:
+        base.append(("llm.model_name", model_id))
+        base.append(("gen_ai.request.model", model_id))
+    if has_agent:
+        base.append(("llm.system", "strands-agents"))
+        base.append(("llm.provider", "strands-agents"))
+    return tuple(base)
+
+
 class StrandsToOpenInferenceProcessor(SpanProcessor):
     """
     SpanProcessor that converts Strands telemetry attributes to OpenInference format
     for compatibility with Arize AI, updated for new OpenTelemetry GenAI conventions.
     """
 
-    def __init__(self, debug: bool = False):
+    # SpanProcessor does not declare __slots__, so instances keep a __dict__;
+    # the processor's own state still gets slot storage and faster access
+    __slots__ = (
+        "_event_handlers",
+        "_lock",
+        "_queue",
+        "_stopped",
+        "_worker",
+        "current_cycle_id",
+        "debug",
+        "flatten_messages",
+        "max_batch_size",
+        "next_processor",
+        "processed_span_count",
+        "span_hierarchy",
+    )
+
+    # Upper bound on spans tracked in span_hierarchy (oldest evicted first)
+    _MAX_TRACKED_SPANS = 4096
+
+    # Queue item that tells the background worker to exit
+    _STOP = object()
+
+    def __init__(self, debug: bool = False, next_processor: SpanProcessor | None = None,
+                 max_queue_size: int = 4096, max_batch_size: int = 64,
+                 flatten_messages: bool = True):
         """
         Initialize the processor.
         
         Args:
             debug: Whether to log debug information
+            next_processor: Optional processor (e.g. a BatchSpanProcessor) that receives
+                each span after it has been transformed. When set, transformation runs
+                on a background thread so on_end returns immediately.
+            max_queue_size: Maximum number of ended spans waiting for the background worker
+            max_batch_size: Maximum number of spans the worker drains per wake-up
+            flatten_messages: Whether to also emit the per-field
+                llm.{input,output}_messages.N.message.* attributes that Arize uses to
+                render conversations. Disable to send only the JSON-encoded message lists.
         """
         super().__init__()
         self.debug = debug
-        self.processed_spans = set()
+        self.flatten_messages = flatten_messages
+        self.next_processor = next_processor
+        self.max_batch_size = max_batch_size
+        self._queue = None
+        self._worker = None
+        if next_processor is not None:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            self._worker = threading.Thread(
+                target=self._run_worker, name="StrandsToOpenInferenceProcessor", daemon=True
+            )
+            self._worker.start()
+        # Guards the queue hand-off, span_hierarchy and the span count, which are
+        # touched by callers ending spans as well as by the background worker
+        self._lock = threading.Lock()
+        self._stopped = False
+        self.processed_span_count = 0
         self.current_cycle_id = None
-        self.span_hierarchy = {}
+        self.span_hierarchy = OrderedDict()
+        self._event_handlers = {
+            "gen_ai.user.message": self._on_user_message,
+            "gen_ai.assistant.message": self._on_assistant_message,
+            "gen_ai.choice": self._on_choice,
+            "gen_ai.tool.message": self._on_tool_message,
+        }
 
     def on_start(self, span, parent_context=None):
         """Called when a span is started. Track span hierarchy."""
@@ -43,31 +200,100 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
             parent_id = parent_context.span_id
         elif span.parent and hasattr(span.parent, 'span_id'):
             parent_id = span.parent.span_id
+        
+        # Strands sets event_loop.cycle_id only after the span has started, so keep
+        # the cycle span's live attributes and read the id when a child ends
+        span_name = span.name
+        cycle_attributes = None
+        if span_name == "execute_event_loop_cycle" or span_name.startswith("Cycle"):
+            cycle_attributes = getattr(span, '_attributes', None)
+        
+        with self._lock:
+            # Resolve the enclosing cycle now so the child needs no parent lookup later;
+            # only its entry is kept, the id itself is read once the child ends
+            parent_info = self.span_hierarchy.get(parent_id) if parent_id else None
+            parent_cycle = None
+            if parent_info and parent_info['cycle_attributes'] is not None:
+                parent_cycle = parent_info
             
-        self.span_hierarchy[span_id] = {
-            'name': span.name,
-            'span_id': span_id,
-            'parent_id': parent_id,
-            'start_time': datetime.now().isoformat()
-        }
+            # Entries are removed in on_end; the cap guards against spans that never end
+            if len(self.span_hierarchy) >= self._MAX_TRACKED_SPANS:
+                self.span_hierarchy.popitem(last=False)
+            self.span_hierarchy[span_id] = {
+                'name': span_name,
+                'span_id': span_id,
+                'parent_id': parent_id,
+                'cycle_attributes': cycle_attributes,
+                'cycle_id': None,
+                'parent_cycle': parent_cycle,
+            }
+        if self.next_processor is not None:
+            self.next_processor.on_start(span, parent_context=parent_context)
 
-    def on_end(self, span: Span):
+    def on_end(self, span: Span) -> None:
         """
         Called when a span ends. Transform the span attributes from Strands format
         to OpenInference format.
         """
-        if not hasattr(span, '_attributes') or not span._attributes:
+        if self._queue is None:
+            self._process_span(span)
             return
 
-        original_attrs = dict(span._attributes)
+        with self._lock:
+            if not self._stopped:
+                try:
+                    self._queue.put_nowait(span)
+                    return
+                except queue.Full:
+                    pass
+
+        # Worker is behind or already shut down: transform inline rather than
+        # dropping the span. Cycle ids are stamped before a cycle span is
+        # rewritten, so children still waiting in the queue keep their link.
+        self._process_span(span)
+        self.next_processor.on_end(span)
+
+    def _run_worker(self) -> None:
+        """Transform queued spans in batches and hand them to the next processor."""
+        work_queue = self._queue
+        while True:
+            batch = [work_queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(work_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for span in batch:
+                if span is self._STOP:
+                    stop = True
+                else:
+                    try:
+                        self._process_span(span)
+                        self.next_processor.on_end(span)
+                    except Exception as e:
+                        logger.error(f"Failed to forward span '{span.name}': {e}", exc_info=True)
+                work_queue.task_done()
+            if stop:
+                return
+
+    def _process_span(self, span: Span) -> None:
+        """Transform a single ended span in place."""
         span_id = span.get_span_context().span_id
-        
-        if span_id in self.span_hierarchy:
-            self.span_hierarchy[span_id]['attributes'] = original_attrs
+        if not hasattr(span, '_attributes') or not span._attributes:
+            with self._lock:
+                self.span_hierarchy.pop(span_id, None)
+            return
+
+        # Read the live attributes without copying; they are only rewritten
+        # once the transformation has succeeded, so failures leave them intact
+        attrs = span._attributes
+        original_count = len(attrs)
         
         try:
-            if "event_loop.cycle_id" in original_attrs:
-                self.current_cycle_id = original_attrs.get("event_loop.cycle_id")
+            if "event_loop.cycle_id" in attrs:
+                self.current_cycle_id = attrs.get("event_loop.cycle_id")
             
             # Extract events if available
             events = []
@@ -76,51 +302,57 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
             elif hasattr(span, 'events'):
                 events = span.events
                 
-            transformed_attrs = self._transform_attributes(original_attrs, span, events)
-            span._attributes.clear()
-            span._attributes.update(transformed_attrs)
-            self.processed_spans.add(span_id)
+            transformed_attrs = self._transform_attributes(attrs, span, events)
+        except Exception as e:
+            logger.error(f"Failed to transform span '{span.name}': {e}", exc_info=True)
+        else:
+            with self._lock:
+                entry = self.span_hierarchy.get(span_id)
+                # event_loop.cycle_id moves into metadata below; keep it for children
+                # that are transformed after this span
+                if entry is not None and entry['cycle_attributes'] is not None:
+                    entry['cycle_id'] = attrs.get("event_loop.cycle_id")
+                self.processed_span_count += 1
+            for key in attrs.keys() - transformed_attrs.keys():
+                del attrs[key]
+            attrs.update(transformed_attrs)
             
             if self.debug:
-                logger.info(f"Transformed span '{span.name}': {len(original_attrs)} -> {len(transformed_attrs)} attributes")
+                logger.info(f"Transformed span '{span.name}': {original_count} -> {len(transformed_attrs)} attributes")
                 logger.info(f"Processed {len(events)} events")
-                
-        except Exception as e:
-            logger.error(f"Failed to transform span '{span.name}': {e}", exc_info=True)
-            span._attributes.clear()
-            span._attributes.update(original_attrs)
 
-    def _transform_attributes(self, attrs: Dict[str, Any], span: Span, events: List = None) -> Dict[str, Any]:
+        # Children hold their own reference to the enclosing cycle's entry, so the
+        # ended span's entry is no longer needed
+        with self._lock:
+            self.span_hierarchy.pop(span_id, None)
+
+    def _transform_attributes(self, attrs: dict[str, Any], span: Span, events: list | None = None) -> dict[str, Any]:
         """
         Transform Strands attributes to OpenInference format, including event processing.
         """
         result = {}
         span_kind = self._determine_span_kind(span, attrs)
-        result["openinference.span.kind"] = span_kind
+        model_id = attrs.get("gen_ai.request.model")
+        has_agent = bool(_first(attrs, _AGENT_NAME_KEYS))
+        try:
+            result.update(_base_attrs(span_kind, model_id, has_agent))
+        except TypeError:
+            # Unhashable model id; build the attributes without caching
+            result.update(_base_attrs.__wrapped__(span_kind, model_id, has_agent))
         self._set_graph_node_attributes(span, attrs, result)
         
-        # Extract messages from events if available, otherwise fall back to attributes
-        if events and len(events) > 0:
-            input_messages, output_messages = self._extract_messages_from_events(events)
-        else:
-            # Fallback to attribute-based extraction
-            prompt = attrs.get("gen_ai.prompt")
-            completion = attrs.get("gen_ai.completion")
-            if prompt or completion:
-                input_messages, output_messages = self._extract_messages_from_attributes(prompt, completion)
+        # Extract messages from events if available, otherwise fall back to attributes.
+        # TOOL spans read their events directly, so they skip message extraction.
+        input_messages, output_messages = [], []
+        if span_kind != "TOOL":
+            if events:
+                input_messages, output_messages = self._extract_messages_from_events(events)
             else:
-                input_messages, output_messages = [], []
-        
-        model_id = attrs.get("gen_ai.request.model")
-        agent_name = attrs.get("agent.name") or attrs.get("gen_ai.agent.name")
-
-        if model_id:
-            result["llm.model_name"] = model_id
-            result["gen_ai.request.model"] = model_id
-            
-        if agent_name:
-            result["llm.system"] = "strands-agents"
-            result["llm.provider"] = "strands-agents"
+                # Fallback to attribute-based extraction
+                prompt = attrs.get("gen_ai.prompt")
+                completion = attrs.get("gen_ai.completion")
+                if prompt or completion:
+                    input_messages, output_messages = self._extract_messages_from_attributes(prompt, completion)
         
         # Handle tags (both Strands arize.tags and standard tag.tags)
         self._handle_tags(attrs, result)
@@ -153,45 +385,57 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
         input_messages = []
         output_messages = []
         
+        handlers = self._event_handlers
+        
         for event in events:
-            event_name = getattr(event, 'name', '') if hasattr(event, 'name') else event.get('name', '')
-            event_attrs = getattr(event, 'attributes', {}) if hasattr(event, 'attributes') else event.get('attributes', {})
+            try:
+                event_name = event.name
+                event_attrs = event.attributes
+            except AttributeError:
+                event_name = event.get('name', '')
+                event_attrs = event.get('attributes', {})
             
-            if event_name == "gen_ai.user.message":
-                content = event_attrs.get('content', '')
-                message = self._parse_message_content(content, 'user')
-                if message:
-                    input_messages.append(message)
-                    
-            elif event_name == "gen_ai.assistant.message":
-                content = event_attrs.get('content', '')
-                message = self._parse_message_content(content, 'assistant')
-                if message:
-                    output_messages.append(message)
-                    
-            elif event_name == "gen_ai.choice":
-                # Final response from the agent
-                message_content = event_attrs.get('message', '')
-                if message_content:
-                    message = self._parse_message_content(message_content, 'assistant')
-                    if message:
-                        # Set finish reason if available
-                        if 'finish_reason' in event_attrs:
-                            message['message.finish_reason'] = event_attrs['finish_reason']
-                        output_messages.append(message)
-                        
-            elif event_name == "gen_ai.tool.message":
-                # Tool messages - treat as user messages with tool role
-                content = event_attrs.get('content', '')
-                tool_id = event_attrs.get('id', '')
-                if content:
-                    message = self._parse_message_content(content, 'tool')
-                    if message and tool_id:
-                        message['message.tool_call_id'] = tool_id
-                        input_messages.append(message)
+            handler = handlers.get(event_name)
+            if handler:
+                handler(event_attrs, input_messages, output_messages)
         
         return input_messages, output_messages
 
+    def _on_user_message(self, event_attrs: dict[str, Any], input_messages: list[dict], output_messages: list[dict]) -> None:
+        """Handle a gen_ai.user.message event."""
+        content = event_attrs.get('content', '')
+        message = self._parse_message_content(content, _ROLE_USER)
+        if message:
+            input_messages.append(message)
+
+    def _on_assistant_message(self, event_attrs: dict[str, Any], input_messages: list[dict], output_messages: list[dict]) -> None:
+        """Handle a gen_ai.assistant.message event."""
+        content = event_attrs.get('content', '')
+        message = self._parse_message_content(content, _ROLE_ASSISTANT)
+        if message:
+            output_messages.append(message)
+
+    def _on_choice(self, event_attrs: dict[str, Any], input_messages: list[dict], output_messages: list[dict]) -> None:
+        """Handle a gen_ai.choice event (final response from the agent)."""
+        message_content = event_attrs.get('message', '')
+        if message_content:
+            message = self._parse_message_content(message_content, _ROLE_ASSISTANT)
+            if message:
+                # Set finish reason if available
+                if 'finish_reason' in event_attrs:
+                    message[_K_FINISH_REASON] = event_attrs['finish_reason']
+                output_messages.append(message)
+
+    def _on_tool_message(self, event_attrs: dict[str, Any], input_messages: list[dict], output_messages: list[dict]) -> None:
+        """Handle a gen_ai.tool.message event - treated as an input message with tool role."""
+        content = event_attrs.get('content', '')
+        tool_id = event_attrs.get('id', '')
+        if content:
+            message = self._parse_message_content(content, _ROLE_TOOL)
+            if message and tool_id:
+                message[_K_TOOL_CALL_ID] = tool_id
+                input_messages.append(message)
+
     def _extract_messages_from_attributes(self, prompt: Any, completion: Any) -> tuple[List[Dict], List[Dict]]:
         """Fallback method to extract messages from attributes."""
         input_messages = []
@@ -200,23 +444,23 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
         if prompt:
             if isinstance(prompt, str):
                 try:
-                    prompt_data = json.loads(prompt)
+                    prompt_data = _loads(prompt)
                     if isinstance(prompt_data, list):
                         for msg in prompt_data:
                             normalized = self._normalize_message(msg)
-                            if normalized.get('message.role') == 'user':
+                            if normalized.get(_K_ROLE) == _ROLE_USER:
                                 input_messages.append(normalized)
                 except json.JSONDecodeError:
                     # Simple string prompt
                     input_messages.append({
-                        'message.role': 'user',
-                        'message.content': str(prompt)
+                        _K_ROLE: _ROLE_USER,
+                        _K_CONTENT: str(prompt)
                     })
         
         if completion:
             if isinstance(completion, str):
                 try:
-                    completion_data = json.loads(completion)
+                    completion_data = _loads(completion)
                     if isinstance(completion_data, list):
                         # Handle Strands completion format
                         message = self._parse_strands_completion(completion_data)
@@ -225,8 +469,8 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                 except json.JSONDecodeError:
                     # Simple string completion
                     output_messages.append({
-                        'message.role': 'assistant',
-                        'message.content': str(completion)
+                        _K_ROLE: _ROLE_ASSISTANT,
+                        _K_CONTENT: str(completion)
                     })
         
         return input_messages, output_messages
@@ -238,14 +482,14 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
             
         try:
             # Try to parse as JSON first
-            content_data = json.loads(content) if isinstance(content, str) else content
+            content_data = _loads(content) if isinstance(content, str) else content
             
             if isinstance(content_data, list):
                 # New Strands format: [{"text": "..."}, {"toolUse": {...}}, {"toolResult": {...}}]
                 message = {
-                    'message.role': role,
-                    'message.content': '',
-                    'message.tool_calls': []
+                    _K_ROLE: role,
+                    _K_CONTENT: '',
+                    _K_TOOL_CALLS: []
                 }
                 
                 text_parts = []
@@ -258,63 +502,64 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                             tool_call = {
                                 'tool_call.id': tool_use.get('toolUseId', ''),
                                 'tool_call.function.name': tool_use.get('name', ''),
-                                'tool_call.function.arguments': json.dumps(tool_use.get('input', {}))
+                                'tool_call.function.arguments': _dumps(tool_use.get('input', {}))
                             }
-                            message['message.tool_calls'].append(tool_call)
+                            message[_K_TOOL_CALLS].append(tool_call)
                         elif 'toolResult' in item:
                             # Handle tool results - extract text content
                             tool_result = item['toolResult']
                             if 'content' in tool_result:
                                 if isinstance(tool_result['content'], list):
-                                    for tr_content in tool_result['content']:
-                                        if isinstance(tr_content, dict) and 'text' in tr_content:
-                                            text_parts.append(str(tr_content['text']))
+                                    text_parts.extend(
+                                        str(tr_content['text']) for tr_content in tool_result['content']
+                                        if isinstance(tr_content, dict) and 'text' in tr_content
+                                    )
                                 elif isinstance(tool_result['content'], str):
                                     text_parts.append(tool_result['content'])
                             # Set role to tool for tool results and include tool call ID
-                            message['message.role'] = 'tool'
+                            message[_K_ROLE] = _ROLE_TOOL
                             if 'toolUseId' in tool_result:
-                                message['message.tool_call_id'] = tool_result['toolUseId']
+                                message[_K_TOOL_CALL_ID] = tool_result['toolUseId']
                 
-                message['message.content'] = ' '.join(text_parts) if text_parts else ''
+                message[_K_CONTENT] = ' '.join(text_parts) if text_parts else ''
                 
                 # Clean up empty tool_calls
-                if not message['message.tool_calls']:
-                    del message['message.tool_calls']
+                if not message[_K_TOOL_CALLS]:
+                    del message[_K_TOOL_CALLS]
                 
                 return message
             elif isinstance(content_data, dict):
                 # Handle single dict format (like tool messages)
                 if 'text' in content_data:
                     return {
-                        'message.role': role,
-                        'message.content': str(content_data['text'])
+                        _K_ROLE: role,
+                        _K_CONTENT: str(content_data['text'])
                     }
                 else:
                     return {
-                        'message.role': role,
-                        'message.content': str(content_data)
+                        _K_ROLE: role,
+                        _K_CONTENT: str(content_data)
                     }
             else:
                 # Simple string content
                 return {
-                    'message.role': role,
-                    'message.content': str(content_data)
+                    _K_ROLE: role,
+                    _K_CONTENT: str(content_data)
                 }
                 
         except (json.JSONDecodeError, TypeError):
             # Fallback to string content
             return {
-                'message.role': role,
-                'message.content': str(content)
+                _K_ROLE: role,
+                _K_CONTENT: str(content)
             }
 
     def _parse_strands_completion(self, completion_data: List[Any]) -> Optional[Dict]:
         """Parse Strands completion format into a message."""
         message = {
-            'message.role': 'assistant',
-            'message.content': '',
-            'message.tool_calls': []
+            _K_ROLE: _ROLE_ASSISTANT,
+            _K_CONTENT: '',
+            _K_TOOL_CALLS: []
         }
         
         text_parts = []
@@ -327,33 +572,35 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                     tool_call = {
                         'tool_call.id': tool_use.get('toolUseId', ''),
                         'tool_call.function.name': tool_use.get('name', ''),
-                        'tool_call.function.arguments': json.dumps(tool_use.get('input', {}))
+                        'tool_call.function.arguments': _dumps(tool_use.get('input', {}))
                     }
-                    message['message.tool_calls'].append(tool_call)
+                    message[_K_TOOL_CALLS].append(tool_call)
         
-        message['message.content'] = ' '.join(text_parts) if text_parts else ''
+        message[_K_CONTENT] = ' '.join(text_parts) if text_parts else ''
         
         # Clean up empty arrays
-        if not message['message.tool_calls']:
-            del message['message.tool_calls']
+        if not message[_K_TOOL_CALLS]:
+            del message[_K_TOOL_CALLS]
         
-        return message if message['message.content'] or 'message.tool_calls' in message else None
+        return message if message[_K_CONTENT] or _K_TOOL_CALLS in message else None
 
-    def _handle_llm_span(self, attrs: Dict[str, Any], result: Dict[str, Any], 
-                        input_messages: List[Dict], output_messages: List[Dict]):
+    def _handle_llm_span(self, attrs: dict[str, Any], result: dict[str, Any], 
+                        input_messages: list[dict], output_messages: list[dict]) -> None:
         """Handle LLM/Agent span with extracted messages."""
         
         # Create message arrays
         if input_messages:
-            result["llm.input_messages"] = json.dumps(input_messages, separators=(",", ":"))
-            self._flatten_messages(input_messages, "llm.input_messages", result)
+            result["llm.input_messages"] = _dumps(input_messages)
+            if self.flatten_messages:
+                self._flatten_messages(input_messages, "llm.input_messages", result)
         
         if output_messages:
-            result["llm.output_messages"] = json.dumps(output_messages, separators=(",", ":"))
-            self._flatten_messages(output_messages, "llm.output_messages", result)
+            result["llm.output_messages"] = _dumps(output_messages)
+            if self.flatten_messages:
+                self._flatten_messages(output_messages, "llm.output_messages", result)
         
         # Handle agent tools
-        if tools := (attrs.get("gen_ai.agent.tools") or attrs.get("agent.tools")):
+        if tools := _first(attrs, _AGENT_TOOLS_KEYS):
             self._map_tools(tools, result)
         
         # Create input/output values
@@ -362,25 +609,28 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
         # Map invocation parameters
         self._map_invocation_parameters(attrs, result)
 
-    def _flatten_messages(self, messages: List[Dict], key_prefix: str, result: Dict[str, Any]):
+    def _flatten_messages(self, messages: list[dict], key_prefix: str, result: dict[str, Any]) -> None:
         """Flatten message structure for OpenInference."""
         for idx, msg in enumerate(messages):
+            base = f"{key_prefix}.{idx}.message."
             for key, value in msg.items():
-                clean_key = key.replace("message.", "") if key.startswith("message.") else key
-                dotted_key = f"{key_prefix}.{idx}.message.{clean_key}"
+                clean_key = _MSG_KEY_CLEAN.get(key)
+                if clean_key is None:
+                    clean_key = key.replace("message.", "") if key.startswith("message.") else key
                 
                 if clean_key == "tool_calls" and isinstance(value, list):
                     # Handle tool calls
+                    tc_base = base + "tool_calls."
                     for tool_idx, tool_call in enumerate(value):
                         if isinstance(tool_call, dict):
+                            tool_base = tc_base + str(tool_idx) + "."
                             for tool_key, tool_val in tool_call.items():
-                                tool_dotted_key = f"{key_prefix}.{idx}.message.tool_calls.{tool_idx}.{tool_key}"
-                                result[tool_dotted_key] = self._serialize_value(tool_val)
+                                result[tool_base + tool_key] = self._serialize_value(tool_val)
                 else:
-                    result[dotted_key] = self._serialize_value(value)
+                    result[base + clean_key] = self._serialize_value(value)
 
-    def _create_input_output_values(self, attrs: Dict[str, Any], result: Dict[str, Any],
-                                   input_messages: List[Dict], output_messages: List[Dict]):
+    def _create_input_output_values(self, attrs: dict[str, Any], result: dict[str, Any],
+                                   input_messages: list[dict], output_messages: list[dict]) -> None:
         """Create input.value and output.value for Arize compatibility."""
         span_kind = result.get("openinference.span.kind")
         model_name = result.get("llm.model_name") or attrs.get("gen_ai.request.model") or "unknown"
@@ -388,9 +638,9 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
         if span_kind in ["LLM", "AGENT", "CHAIN"]:
             # Create input.value
             if input_messages:
-                if len(input_messages) == 1 and input_messages[0].get('message.role') == 'user':
+                if len(input_messages) == 1 and input_messages[0].get(_K_ROLE) == _ROLE_USER:
                     # Simple user message
-                    result["input.value"] = input_messages[0].get('message.content', '')
+                    result["input.value"] = input_messages[0].get(_K_CONTENT, '')
                     result["input.mime_type"] = "text/plain"
                 else:
                     # Complex conversation
@@ -398,23 +648,23 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                         "messages": input_messages,
                         "model": model_name
                     }
-                    result["input.value"] = json.dumps(input_structure, separators=(",", ":"))
+                    result["input.value"] = _dumps(input_structure)
                     result["input.mime_type"] = "application/json"
             
             # Create output.value  
             if output_messages:
                 last_message = output_messages[-1]
-                content = last_message.get('message.content', '')
+                content = last_message.get(_K_CONTENT, '')
                 
                 if span_kind == "LLM":
                     # LLM format
                     output_structure = {
                         "choices": [{
-                            "finish_reason": last_message.get('message.finish_reason', 'stop'),
+                            "finish_reason": last_message.get(_K_FINISH_REASON, 'stop'),
                             "index": 0,
                             "message": {
                                 "content": content,
-                                "role": last_message.get('message.role', 'assistant')
+                                "role": last_message.get(_K_ROLE, _ROLE_ASSISTANT)
                             }
                         }],
                         "model": model_name,
@@ -424,14 +674,14 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                             "total_tokens": result.get("llm.token_count.total")
                         }
                     }
-                    result["output.value"] = json.dumps(output_structure, separators=(",", ":"))
+                    result["output.value"] = _dumps(output_structure)
                     result["output.mime_type"] = "application/json"
                 else:
                     # Simple text output for AGENT/CHAIN
                     result["output.value"] = content
                     result["output.mime_type"] = "text/plain"
 
-    def _handle_tags(self, attrs: Dict[str, Any], result: Dict[str, Any]):
+    def _handle_tags(self, attrs: dict[str, Any], result: dict[str, Any]) -> None:
         """Handle both Strands arize.tags and standard tag.tags formats."""
         tags = None
         
@@ -452,37 +702,37 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
         span_name = span.name
         
         # Handle new span naming conventions
-        if span_name == "chat":
-            return "LLM"
-        elif span_name.startswith("execute_tool "):
-            return "TOOL"
-        elif span_name == "execute_event_loop_cycle":
-            return "CHAIN"
-        elif span_name.startswith("invoke_agent"):
-            return "AGENT"
+        span_kind = _EXACT_SPAN_KINDS.get(span_name)
+        if span_kind:
+            return span_kind
+        if span_name.startswith(_SPAN_KIND_PREFIXES):
+            for prefix, span_kind in _PREFIX_SPAN_KINDS:
+                if span_name.startswith(prefix):
+                    return span_kind
+        
         # Legacy support for old naming
-        elif "Model invoke" in span_name:
+        if "Model invoke" in span_name:
             return "LLM"
         elif span_name.startswith("Tool:"):
             return "TOOL"
         elif "Cycle" in span_name:
             return "CHAIN"
-        elif attrs.get("gen_ai.agent.name") or attrs.get("agent.name"):
+        elif _first(attrs, _AGENT_NAME_KEYS):
             return "AGENT"
         
         return "CHAIN"
     
-    def _set_graph_node_attributes(self, span: Span, attrs: Dict[str, Any], result: Dict[str, Any]):
+    def _set_graph_node_attributes(self, span: Span, attrs: dict[str, Any], result: dict[str, Any]) -> None:
         """Set graph node attributes for Arize visualization with updated span names."""
         span_name = span.name
         span_kind = result["openinference.span.kind"]        
         span_id = span.get_span_context().span_id
         
-        # Get parent information from span hierarchy
-        span_info = self.span_hierarchy.get(span_id, {})
-        parent_id = span_info.get('parent_id')
-        parent_info = self.span_hierarchy.get(parent_id, {}) if parent_id else {}
-        parent_name = parent_info.get('name', '')
+        # Enclosing cycle resolved in on_start; its id has been set by the time
+        # the child ends
+        span_info = self.span_hierarchy.get(span_id)
+        parent_cycle = span_info['parent_cycle'] if span_info else None
+        parent_cycle_id = _cycle_id(parent_cycle) if parent_cycle else None
         
         if span_kind == "AGENT":
             result["graph.node.id"] = "strands_agent"
@@ -497,27 +747,19 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                 result["graph.node.parent_id"] = "strands_agent"
         elif span_kind == "LLM":
             result["graph.node.id"] = f"llm_{span_id}"
-            if parent_name == "execute_event_loop_cycle" or parent_name.startswith("Cycle"):
-                parent_cycle_id = parent_info.get('attributes', {}).get('event_loop.cycle_id')
-                if parent_cycle_id:
-                    result["graph.node.parent_id"] = f"cycle_{parent_cycle_id}"
-                else:
-                    result["graph.node.parent_id"] = "strands_agent"
+            if parent_cycle_id:
+                result["graph.node.parent_id"] = f"cycle_{parent_cycle_id}"
             else:
                 result["graph.node.parent_id"] = "strands_agent"
         elif span_kind == "TOOL":
             tool_name = span_name.replace("execute_tool ", "") if span_name.startswith("execute_tool ") else "unknown_tool"
             result["graph.node.id"] = f"tool_{tool_name}_{span_id}"
-            if parent_name == "execute_event_loop_cycle" or parent_name.startswith("Cycle"):
-                parent_cycle_id = parent_info.get('attributes', {}).get('event_loop.cycle_id')
-                if parent_cycle_id:
-                    result["graph.node.parent_id"] = f"cycle_{parent_cycle_id}"
-                else:
-                    result["graph.node.parent_id"] = "strands_agent"
+            if parent_cycle_id:
+                result["graph.node.parent_id"] = f"cycle_{parent_cycle_id}"
             else:
                 result["graph.node.parent_id"] = "strands_agent"
 
-    def _handle_tool_span(self, attrs: Dict[str, Any], result: Dict[str, Any], events: List = None):
+    def _handle_tool_span(self, attrs: dict[str, Any], result: dict[str, Any], events: list | None = None) -> None:
         """Handle tool-specific attributes with enhanced event processing."""
         # Extract tool information
         tool_name = attrs.get("gen_ai.tool.name")
@@ -539,15 +781,19 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
             tool_output = None
             
             for event in events:
-                event_name = getattr(event, 'name', '') if hasattr(event, 'name') else event.get('name', '')
-                event_attrs = getattr(event, 'attributes', {}) if hasattr(event, 'attributes') else event.get('attributes', {})
+                try:
+                    event_name = event.name
+                    event_attrs = event.attributes
+                except AttributeError:
+                    event_name = event.get('name', '')
+                    event_attrs = event.get('attributes', {})
                 
                 if event_name == "gen_ai.tool.message":
                     # Tool input - extract parameters for tool.parameters attribute
                     content = event_attrs.get('content', '')
                     if content:
                         try:
-                            content_data = json.loads(content) if isinstance(content, str) else content
+                            content_data = _loads(content) if isinstance(content, str) else content
                             if isinstance(content_data, dict):
                                 tool_parameters = content_data
                             else:
@@ -560,37 +806,43 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                     message = event_attrs.get('message', '')
                     if message:
                         try:
-                            message_data = json.loads(message) if isinstance(message, str) else message
+                            message_data = _loads(message) if isinstance(message, str) else message
                             if isinstance(message_data, list):
-                                text_parts = []
-                                for item in message_data:
-                                    if isinstance(item, dict) and 'text' in item:
-                                        text_parts.append(item['text'])
+                                text_parts = [
+                                    item['text'] for item in message_data
+                                    if isinstance(item, dict) and 'text' in item
+                                ]
                                 tool_output = ' '.join(text_parts) if text_parts else str(message_data)
                             else:
                                 tool_output = str(message_data)
                         except (json.JSONDecodeError, TypeError):
                             tool_output = str(message)
+                
+                # A tool span carries one input and one output event
+                if tool_parameters is not None and tool_output is not None:
+                    break
             
             # Set the crucial tool.parameters attribute as JSON string
             if tool_parameters:
-                result["tool.parameters"] = json.dumps(tool_parameters, separators=(",", ":"))
+                tool_parameters_json = _dumps(tool_parameters)
+                result["tool.parameters"] = tool_parameters_json
                 
                 # Create input messages showing the tool call that triggered this tool execution
                 if tool_name and tool_call_id:
                     input_messages = [{
-                        'message.role': 'assistant',
-                        'message.content': '',
-                        'message.tool_calls': [{
+                        _K_ROLE: _ROLE_ASSISTANT,
+                        _K_CONTENT: '',
+                        _K_TOOL_CALLS: [{
                             'tool_call.id': tool_call_id,
                             'tool_call.function.name': tool_name,
-                            'tool_call.function.arguments': json.dumps(tool_parameters, separators=(",", ":"))
+                            'tool_call.function.arguments': tool_parameters_json
                         }]
                     }]
                     
                     # Set the flattened input messages for proper display in Arize
-                    result["llm.input_messages"] = json.dumps(input_messages, separators=(",", ":"))
-                    self._flatten_messages(input_messages, "llm.input_messages", result)
+                    result["llm.input_messages"] = _dumps(input_messages)
+                    if self.flatten_messages:
+                        self._flatten_messages(input_messages, "llm.input_messages", result)
                 
                 # Also set input.value for display purposes
                 if isinstance(tool_parameters, dict):
@@ -598,18 +850,18 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                         result["input.value"] = tool_parameters['text']
                         result["input.mime_type"] = "text/plain"
                     else:
-                        result["input.value"] = json.dumps(tool_parameters, separators=(",", ":"))
+                        result["input.value"] = tool_parameters_json
                         result["input.mime_type"] = "application/json"
                         
             if tool_output:
                 result["output.value"] = tool_output
                 result["output.mime_type"] = "text/plain"
 
-    def _map_tools(self, tools_data: Any, result: Dict[str, Any]):
+    def _map_tools(self, tools_data: Any, result: dict[str, Any]) -> None:
         """Map tools from Strands to OpenInference format."""
         if isinstance(tools_data, str):
             try:
-                tools_data = json.loads(tools_data)
+                tools_data = _loads(tools_data)
             except json.JSONDecodeError:
                 return
         
@@ -628,23 +880,15 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                 result[f"llm.tools.{idx}.tool.description"] = tool.get("description", "")
                 if "parameters" in tool or "input_schema" in tool:
                     schema = tool.get("parameters") or tool.get("input_schema")
-                    result[f"llm.tools.{idx}.tool.json_schema"] = json.dumps(schema)
+                    result[f"llm.tools.{idx}.tool.json_schema"] = _dumps(schema)
 
-    def _map_token_usage(self, attrs: Dict[str, Any], result: Dict[str, Any]):
+    def _map_token_usage(self, attrs: dict[str, Any], result: dict[str, Any]) -> None:
         """Map token usage metrics."""
-        token_mappings = [
-            ("gen_ai.usage.prompt_tokens", "llm.token_count.prompt"),
-            ("gen_ai.usage.input_tokens", "llm.token_count.prompt"),  # Alternative name
-            ("gen_ai.usage.completion_tokens", "llm.token_count.completion"),
-            ("gen_ai.usage.output_tokens", "llm.token_count.completion"),  # Alternative name
-            ("gen_ai.usage.total_tokens", "llm.token_count.total"),
-        ]
-        
-        for strands_key, openinf_key in token_mappings:
+        for strands_key, openinf_key in _TOKEN_MAP:
             if value := attrs.get(strands_key):
                 result[openinf_key] = value
 
-    def _map_invocation_parameters(self, attrs: Dict[str, Any], result: Dict[str, Any]):
+    def _map_invocation_parameters(self, attrs: dict[str, Any], result: dict[str, Any]) -> None:
         """Map invocation parameters."""
         params = {}
         param_mappings = {
@@ -658,61 +902,93 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
                 params[param_key] = attrs[key]
         
         if params:
-            result["llm.invocation_parameters"] = json.dumps(params, separators=(",", ":"))
+            result["llm.invocation_parameters"] = _dumps(params)
 
     def _normalize_message(self, msg: Any) -> Dict[str, Any]:
         """Normalize a single message to OpenInference format."""
         if not isinstance(msg, dict):
-            return {"message.role": "user", "message.content": str(msg)}
+            return {_K_ROLE: _ROLE_USER, _K_CONTENT: str(msg)}
         
         result = {}
         if "role" in msg:
-            result["message.role"] = msg["role"]
+            result[_K_ROLE] = msg["role"]
         
         # Handle content
         if "content" in msg:
             content = msg["content"]
             if isinstance(content, list):
                 # Extract text from content array
-                text_parts = []
-                for item in content:
-                    if isinstance(item, dict) and "text" in item:
-                        text_parts.append(str(item["text"]))
-                result["message.content"] = " ".join(text_parts) if text_parts else ""
+                text_parts = [
+                    str(item["text"]) for item in content
+                    if isinstance(item, dict) and "text" in item
+                ]
+                result[_K_CONTENT] = " ".join(text_parts) if text_parts else ""
             else:
-                result["message.content"] = str(content)
+                result[_K_CONTENT] = str(content)
         
         return result
 
-    def _add_metadata(self, attrs: Dict[str, Any], result: Dict[str, Any]):
+    def _add_metadata(self, attrs: dict[str, Any], result: dict[str, Any]) -> None:
         """Add remaining attributes to metadata."""
-        metadata = {}
-        skip_keys = {"gen_ai.prompt", "gen_ai.completion", "gen_ai.agent.tools", "agent.tools"}
+        metadata = None
         
         for key, value in attrs.items():
-            if key not in skip_keys and key not in result:
-                metadata[key] = self._serialize_value(value)
+            if key in _METADATA_SKIP or key in result:
+                continue
+            if metadata is None:
+                metadata = {}
+            metadata[key] = self._serialize_value(value)
         
         if metadata:
-            result["metadata"] = json.dumps(metadata, separators=(",", ":"))
+            result["metadata"] = _dumps(metadata)
 
     def _serialize_value(self, value: Any) -> Any:
         """Ensure a value is serializable."""
-        if isinstance(value, (str, int, float, bool)) or value is None:
+        if type(value) in _FAST_TYPES:
+            return value
+        # Subclasses of the primitive types (e.g. enums) are passed through too
+        if isinstance(value, (str, int, float, bool)):
             return value
         
         try:
-            return json.dumps(value, separators=(",", ":"))
+            return _dumps(value)
         except (TypeError, OverflowError):
             return str(value)
 
     def shutdown(self):
         """Called when the processor is shutdown."""
-        pass
+        if self.next_processor is None:
+            return
+        with self._lock:
+            if self._stopped:
+                return
+            # Spans ending from now on are transformed inline by on_end
+            self._stopped = True
+        # Bound the whole shutdown: a full queue with a dead worker must not hang it
+        deadline = time.monotonic() + 30
+        try:
+            self._queue.put(self._STOP, timeout=30)
+        except queue.Full:
+            logger.warning("Span queue still full at shutdown; pending spans are dropped")
+        else:
+            self._worker.join(timeout=max(deadline - time.monotonic(), 0))
+        self.next_processor.shutdown()
 
     def force_flush(self, timeout_millis=None):
         """Called to force flush."""
-        return True
+        if self.next_processor is None:
+            return True
+        if timeout_millis is None:
+            timeout_millis = 30000
+        deadline = time.monotonic() + timeout_millis / 1000
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        remaining_millis = max(int((deadline - time.monotonic()) * 1000), 0)
+        return self.next_processor.force_flush(remaining_millis)
 
     @staticmethod
     def get_migration_guide() -> Dict[str, str]:
@@ -752,8 +1028,10 @@ class StrandsToOpenInferenceProcessor(SpanProcessor):
             "supports_events": True,
             "supports_deprecated_attributes": True,
             "supports_new_semantic_conventions": True,
-            "processed_spans": len(self.processed_spans),
+            "processed_spans": self.processed_span_count,
             "debug_enabled": self.debug,
+            "flatten_messages": self.flatten_messages,
+            "background_transform": self.next_processor is not None,
             "migration_guide": self.get_migration_guide(),
             "supported_span_kinds": ["LLM", "AGENT", "CHAIN", "TOOL"],
             "supported_span_names": [
@@ -10,13 +10,17 @@ When Braintrust observability is enabled (via BRAINTRUST_API_KEY env var),
 the agent initializes Strands telemetry to export traces to Braintrust.
 """
 
+import functools
 import logging
 import os
 from typing import Any
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from strands import Agent, tool
-from strands.models import BedrockModel
+
+from tools.calculator_tool import calculator as _calc_impl
+from tools.time_tool import get_time as _time_impl
+from tools.weather_tool import get_weather as _weather_impl
 
 # Configure logging
 logging.basicConfig(
@@ -42,10 +46,8 @@ def get_weather(city: str) -> dict[str, Any]:
     Returns:
         Weather information including temperature, conditions, and humidity
     """
-    from tools.weather_tool import get_weather as weather_impl
-
     logger.info(f"Getting weather for city: {city}")
-    result = weather_impl(city)
+    result = _weather_impl(city)
     logger.debug(f"Weather result: {result}")
 
     return result
@@ -62,10 +64,8 @@ def get_time(timezone: str) -> dict[str, Any]:
     Returns:
         Current time, date, timezone, and UTC offset information
     """
-    from tools.time_tool import get_time as time_impl
-
     logger.info(f"Getting time for timezone: {timezone}")
-    result = time_impl(timezone)
+    result = _time_impl(timezone)
     logger.debug(f"Time result: {result}")
 
     return result
@@ -84,34 +84,54 @@ def calculator(operation: str, a: float, b: float = None) -> dict[str, Any]:
     Returns:
         Calculation result with operation details
     """
-    from tools.calculator_tool import calculator as calc_impl
-
     logger.info(f"Performing calculation: {operation}({a}, {b})")
-    result = calc_impl(operation, a, b)
+    result = _calc_impl(operation, a, b)
     logger.debug(f"Calculator result: {result}")
 
     return result
 
 
-# Initialize Bedrock model
+# Bedrock model used by the agent
 MODEL_ID = "us.anthropic.claude-haiku-4-5-20251001-v1:0"
-model = BedrockModel(model_id=MODEL_ID)
 
-logger.info(f"Initializing Strands agent with model: {MODEL_ID}")
 
+@functools.cache
+def _get_model() -> Any:
+    """
+    Create the Bedrock model on first use.
+
+    Deferring this keeps module import free of Bedrock client setup, so the
+    module can be imported (e.g. for tool schema inspection) without AWS access.
 
-def _initialize_agent() -> Agent:
+    Returns:
+        Shared BedrockModel instance
     """
-    Initialize the agent with proper telemetry configuration.
+    from strands.models import BedrockModel
+
+    logger.info(f"Initializing Strands agent with model: {MODEL_ID}")
+    return BedrockModel(model_id=MODEL_ID)
+
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant with access to weather, time, and calculator tools. "
+    "Use these tools to accurately answer user questions. Always provide clear, "
+    "concise responses based on the tool outputs. When using tools:\n"
+    "- For weather: Use the city name directly\n"
+    "- For time: Use timezone format like 'America/New_York' or city names\n"
+    "- For calculator: Use operations like 'add', 'subtract', 'multiply', 'divide', or 'factorial'\n"
+    "Be friendly and helpful in your responses."
+)
+
+
+@functools.cache
+def _setup_telemetry() -> None:
+    """
+    Initialize Strands telemetry once per process if Braintrust is configured.
 
     This function is called lazily to ensure environment variables
     (especially Braintrust configuration) are set before telemetry
     initialization.
-
-    Returns:
-        Configured Strands Agent instance
     """
-    # Initialize Braintrust telemetry if configured
     braintrust_api_key = os.getenv("BRAINTRUST_API_KEY")
     if braintrust_api_key:
         logger.info("Braintrust observability enabled - initializing telemetry")
@@ -127,22 +147,28 @@ def _initialize_agent() -> Agent:
     else:
         logger.info("Braintrust observability not configured (CloudWatch only)")
 
-    # Create and return the agent
+
+def _create_agent() -> Agent:
+    """
+    Create an agent for a single invocation.
+
+    The model and telemetry are set up once and shared, but each invocation
+    gets its own Agent: an Agent keeps its conversation in agent.messages and
+    does not support concurrent calls, so sharing one would leak history
+    between callers and let parallel requests collide.
+
+    Returns:
+        Configured Strands Agent instance
+    """
+    _setup_telemetry()
+
     agent = Agent(
-        model=model,
+        model=_get_model(),
         tools=[get_weather, get_time, calculator],
-        system_prompt=(
-            "You are a helpful assistant with access to weather, time, and calculator tools. "
-            "Use these tools to accurately answer user questions. Always provide clear, "
-            "concise responses based on the tool outputs. When using tools:\n"
-            "- For weather: Use the city name directly\n"
-            "- For time: Use timezone format like 'America/New_York' or city names\n"
-            "- For calculator: Use operations like 'add', 'subtract', 'multiply', 'divide', or 'factorial'\n"
-            "Be friendly and helpful in your responses."
-        ),
+        system_prompt=SYSTEM_PROMPT,
     )
 
-    logger.info("Agent initialized with tools: get_weather, get_time, calculator")
+    logger.debug("Agent created with tools: get_weather, get_time, calculator")
 
     return agent
 
@@ -171,8 +197,8 @@ def strands_agent_bedrock(payload: dict[str, Any]) -> str:
 
     logger.info(f"Agent invoked with prompt: {user_input}")
 
-    # Initialize agent with proper configuration (lazy initialization)
-    agent = _initialize_agent()
+    # Fresh agent per invocation; the model and telemetry are reused
+    agent = _create_agent()
 
     # Invoke the Strands agent
     response = agent(user_input)
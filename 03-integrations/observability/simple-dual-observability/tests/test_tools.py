@@ -0,0 +1,140 @@
+"""Unit tests for the weather and time tools."""
+
+import dataclasses
+import zoneinfo
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from tools import get_time, get_weather, get_weather_many, weather_tool
+from tools.time_tool import _resolve_timezone, _timezone_names_by_lower
+from tools.weather_tool import MOCK_WEATHER_DATA, WeatherData
+
+
+@pytest.fixture
+def tzdata_only() -> Iterator[None]:
+    """Resolve timezones from the tzdata package only, as in python:3.11-slim."""
+    zoneinfo.reset_tzpath(to=[])
+    _resolve_timezone.cache_clear()
+    _timezone_names_by_lower.cache_clear()
+    yield
+    zoneinfo.reset_tzpath()
+    _resolve_timezone.cache_clear()
+    _timezone_names_by_lower.cache_clear()
+
+
+def _assert_mock_weather_ranges(result: dict[str, Any]) -> None:
+    assert 50 <= result["temperature_f"] <= 95
+    assert 40 <= result["humidity_percent"] <= 90
+    assert result["conditions"] in {"Sunny", "Cloudy", "Partly Cloudy", "Rainy", "Clear"}
+
+
+class TestWeatherTool:
+    def test_get_weather_returns_known_city(self) -> None:
+        result = get_weather("London")
+        assert result == {
+            "city": "London",
+            "temperature_f": 59,
+            "conditions": "Rainy",
+            "humidity_percent": 80,
+        }
+
+    @pytest.mark.parametrize("city", ["new york", "NEW YORK", "  New York\t", "nEw YoRk"])
+    def test_get_weather_normalizes_case_and_whitespace(self, city: str) -> None:
+        result = get_weather(city)
+        assert result["city"] == "New York"
+        assert result["temperature_f"] == 72
+
+    def test_get_weather_generates_data_for_unknown_city(self) -> None:
+        result = get_weather("  springfield ")
+        assert result["city"] == "Springfield"
+        _assert_mock_weather_ranges(result)
+
+    @pytest.mark.parametrize("city", ["", "   ", None, 42])
+    def test_get_weather_rejects_invalid_city(self, city: object) -> None:
+        with pytest.raises(ValueError, match="non-empty string"):
+            get_weather(city)  # type: ignore[arg-type]
+
+    def test_get_weather_many_preserves_order(self) -> None:
+        results = get_weather_many(["Tokyo", "unknown town", "paris"])
+        assert [r["city"] for r in results] == ["Tokyo", "Unknown Town", "Paris"]
+        assert results[0] == get_weather("tokyo")
+        assert results[2] == get_weather("PARIS")
+        _assert_mock_weather_ranges(results[1])
+
+    def test_get_weather_many_handles_duplicates(self) -> None:
+        results = get_weather_many(["Dubai", " dubai ", "DUBAI", "Atlantis", "Atlantis"])
+        assert len(results) == 5
+        assert results[0] == results[1] == results[2] == get_weather("Dubai")
+        # Unknown cities are generated per entry, each with a fresh result dict
+        assert results[3] is not results[4]
+        for result in results[3:]:
+            assert result["city"] == "Atlantis"
+            _assert_mock_weather_ranges(result)
+
+    def test_get_weather_many_empty(self) -> None:
+        assert get_weather_many([]) == []
+
+    def test_get_weather_many_validates_before_lookup(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calls: list[tuple[str, str]] = []
+        monkeypatch.setattr(weather_tool, "_lookup_weather", lambda *args: calls.append(args))
+        with pytest.raises(ValueError, match="non-empty string"):
+            get_weather_many(["Seattle", " ", "Berlin"])
+        assert calls == []
+
+    def test_known_city_results_are_shared(self) -> None:
+        # Documented contract: known-city results are shared and read-only
+        assert get_weather("Tokyo") is get_weather(" tokyo ")
+        assert get_weather_many(["Tokyo"])[0] is get_weather("TOKYO")
+
+    def test_weather_data_is_frozen(self) -> None:
+        weather = MOCK_WEATHER_DATA["london"]
+        assert isinstance(weather, WeatherData)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            weather.temperature = 0  # type: ignore[misc]
+
+    def test_mock_weather_data_is_read_only(self) -> None:
+        with pytest.raises(TypeError):
+            MOCK_WEATHER_DATA["atlantis"] = WeatherData(  # type: ignore[index]
+                temperature=70, conditions="Clear", humidity=50
+            )
+        assert "atlantis" not in MOCK_WEATHER_DATA
+
+
+class TestTimeTool:
+    def test_get_time_returns_data(self) -> None:
+        result = get_time("America/New_York")
+        assert result["timezone"] == "America/New_York"
+        assert result["day_of_week"] in {
+            "Monday",
+            "Tuesday",
+            "Wednesday",
+            "Thursday",
+            "Friday",
+            "Saturday",
+            "Sunday",
+        }
+
+    def test_get_time_accepts_any_case(self) -> None:
+        assert get_time("europe/london")["timezone"] == "europe/london"
+
+    def test_get_time_rejects_empty_timezone(self) -> None:
+        with pytest.raises(ValueError, match="non-empty string"):
+            get_time("  ")
+
+    def test_get_time_rejects_unknown_timezone(self) -> None:
+        with pytest.raises(ValueError, match="Unknown timezone"):
+            get_time("Mars/Olympus_Mons")
+
+    @pytest.mark.usefixtures("tzdata_only")
+    @pytest.mark.parametrize("timezone", ["America", "US", "Europe", "america"])
+    def test_get_time_rejects_region_directory(self, timezone: str) -> None:
+        with pytest.raises(ValueError, match="Unknown timezone"):
+            get_time(timezone)
+
+    @pytest.mark.usefixtures("tzdata_only")
+    def test_get_time_resolves_from_tzdata(self) -> None:
+        assert get_time("Asia/Tokyo")["timezone"] == "Asia/Tokyo"
@@ -2,10 +2,11 @@
 
 from .calculator_tool import calculator
 from .time_tool import get_time
-from .weather_tool import get_weather
+from .weather_tool import get_weather, get_weather_many
 
 __all__ = [
     "get_weather",
+    "get_weather_many",
     "get_time",
     "calculator",
 ]
@@ -109,6 +109,17 @@ def _factorial(
     return math.factorial(int(a))
 
 
+# Two-operand operations: normalized name -> (implementation, name used in errors)
+_BINARY_OPERATIONS = {
+    "add": (_add, "Addition"),
+    "subtract": (_subtract, "Subtraction"),
+    "multiply": (_multiply, "Multiplication"),
+    "divide": (_divide, "Division"),
+}
+
+_VALID_OPERATIONS = (*_BINARY_OPERATIONS, "factorial")
+
+
 def calculator(
     operation: str,
     a: float,
@@ -128,17 +139,17 @@ def calculator(
     Raises:
         ValueError: If operation is invalid or inputs are invalid
     """
-    if not operation or not isinstance(operation, str):
-        logger.error(f"Invalid operation parameter: {operation}")
+    if type(operation) is not str or not (operation_stripped := operation.strip()):
+        logger.error(f"Invalid operation parameter: {operation!r}")
         raise ValueError("Operation must be a non-empty string")
 
-    operation_normalized = operation.strip().lower()
+    operation_normalized = operation_stripped.lower()
 
-    valid_operations = ["add", "subtract", "multiply", "divide", "factorial"]
-    if operation_normalized not in valid_operations:
+    binary_operation = _BINARY_OPERATIONS.get(operation_normalized)
+    if binary_operation is None and operation_normalized != "factorial":
         logger.error(f"Unknown operation: {operation_normalized}")
         raise ValueError(
-            f"Unknown operation: {operation}. Valid operations are: {', '.join(valid_operations)}"
+            f"Unknown operation: {operation}. Valid operations are: {', '.join(_VALID_OPERATIONS)}"
         )
 
     if not isinstance(a, (int, float)):
@@ -149,27 +160,13 @@ def calculator(
 
     result_value: float
 
-    if operation_normalized == "add":
-        if b is None:
-            raise ValueError("Addition requires two numbers")
-        result_value = _add(a, b)
-
-    elif operation_normalized == "subtract":
-        if b is None:
-            raise ValueError("Subtraction requires two numbers")
-        result_value = _subtract(a, b)
-
-    elif operation_normalized == "multiply":
-        if b is None:
-            raise ValueError("Multiplication requires two numbers")
-        result_value = _multiply(a, b)
-
-    elif operation_normalized == "divide":
+    if binary_operation is not None:
+        operation_func, operation_label = binary_operation
         if b is None:
-            raise ValueError("Division requires two numbers")
-        result_value = _divide(a, b)
+            raise ValueError(f"{operation_label} requires two numbers")
+        result_value = operation_func(a, b)
 
-    elif operation_normalized == "factorial":
+    else:
         result_value = _factorial(a)
 
     result = {
@@ -1,10 +1,13 @@
 """Time tool for retrieving current time in different timezones."""
 
+import functools
 import logging
+import time
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Final
 
-import pytz
+if TYPE_CHECKING:
+    from zoneinfo import ZoneInfo
 
 # Configure logging
 logging.basicConfig(
@@ -14,10 +17,53 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Weekday names indexed by datetime.weekday()
+_DAYS: Final = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+@functools.cache
+def _timezone_names_by_lower() -> dict[str, str]:
+    """Map lower-cased timezone names to their canonical spelling.
+
+    Returns:
+        Dictionary of lower-cased name to IANA timezone name
+    """
+    from zoneinfo import available_timezones
+
+    return {name.lower(): name for name in available_timezones()}
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_timezone(
+    timezone: str,
+) -> "ZoneInfo | None":
+    """Resolve a timezone name, caching both hits and misses.
+
+    Args:
+        timezone: The timezone name to resolve
+
+    Returns:
+        Timezone object, or None if the name is unknown
+    """
+    # Imported on first resolution so agents that never ask for the time
+    # do not pay for loading zoneinfo at startup
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError, OSError):
+        # ValueError covers malformed keys such as absolute or relative paths;
+        # OSError covers region directories such as 'America' in the tzdata package
+        pass
+
+    # Accept names in any case (e.g. 'us/eastern'), as pytz did
+    canonical = _timezone_names_by_lower().get(timezone.lower())
+    return ZoneInfo(canonical) if canonical else None
+
 
 def _validate_timezone(
     timezone: str,
-) -> pytz.tzinfo.BaseTzInfo:
+) -> "ZoneInfo":
     """Validate and return timezone object.
 
     Args:
@@ -29,15 +75,15 @@ def _validate_timezone(
     Raises:
         ValueError: If timezone is invalid
     """
-    try:
-        tz = pytz.timezone(timezone)
-        return tz
-    except pytz.exceptions.UnknownTimeZoneError as e:
+    tz = _resolve_timezone(timezone)
+    if tz is None:
         logger.error(f"Unknown timezone: {timezone}")
         raise ValueError(
             f"Unknown timezone: {timezone}. "
             f"Please use a valid timezone name like 'America/New_York' or 'Europe/London'"
-        ) from e
+        )
+
+    return tz
 
 
 def get_time(
@@ -55,32 +101,40 @@ def get_time(
     Raises:
         ValueError: If timezone is empty or invalid
     """
-    if not timezone or not isinstance(timezone, str):
-        logger.error(f"Invalid timezone parameter: {timezone}")
+    if type(timezone) is not str or not (timezone_normalized := timezone.strip()):
+        logger.error(f"Invalid timezone parameter: {timezone!r}")
         raise ValueError("Timezone must be a non-empty string")
 
-    timezone_normalized = timezone.strip()
-
-    if not timezone_normalized:
-        logger.error("Empty timezone after normalization")
-        raise ValueError("Timezone cannot be empty")
-
-    logger.info(f"Getting time for timezone: {timezone_normalized}")
+    # Checked once so the f-string log messages are only built when INFO is enabled
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info(f"Getting time for timezone: {timezone_normalized}")
 
     # Validate and get timezone
     tz = _validate_timezone(timezone_normalized)
 
     # Get current time in timezone
-    current_time = datetime.now(tz)
+    current_time = datetime.fromtimestamp(time.time(), tz)
+
+    # Fixed-width fields formatted directly, equivalent to strftime's
+    # "%I:%M:%S %p", "%Y-%m-%d" and "%A" in the C locale
+    hour = current_time.hour
+    time_str = (
+        f"{hour % 12 or 12:02d}:{current_time.minute:02d}:{current_time.second:02d} "
+        f"{'AM' if hour < 12 else 'PM'}"
+    )
+    date_str = f"{current_time.year:04d}-{current_time.month:02d}-{current_time.day:02d}"
+    day_of_week = _DAYS[current_time.weekday()]
 
     result = {
         "timezone": timezone_normalized,
-        "time": current_time.strftime("%I:%M:%S %p"),
-        "date": current_time.strftime("%Y-%m-%d"),
-        "day_of_week": current_time.strftime("%A"),
+        "time": time_str,
+        "date": date_str,
+        "day_of_week": day_of_week,
         "iso_format": current_time.isoformat(),
     }
 
-    logger.info(f"Time in {timezone_normalized}: {result['date']} {result['time']}")
+    if log_info:
+        logger.info(f"Time in {timezone_normalized}: {result['date']} {result['time']}")
 
     return result
@@ -1,8 +1,13 @@
 """Weather tool for retrieving weather information."""
 
+import functools
 import logging
 import random
-from typing import Any
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Final
 
 # Configure logging
 logging.basicConfig(
@@ -13,36 +18,139 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Mock weather data for demonstration
-MOCK_WEATHER_DATA: dict[str, dict[str, Any]] = {
-    "new york": {"temperature": 72, "conditions": "Partly Cloudy", "humidity": 65},
-    "london": {"temperature": 59, "conditions": "Rainy", "humidity": 80},
-    "tokyo": {"temperature": 68, "conditions": "Clear", "humidity": 55},
-    "paris": {"temperature": 64, "conditions": "Cloudy", "humidity": 70},
-    "sydney": {"temperature": 75, "conditions": "Sunny", "humidity": 60},
-    "berlin": {"temperature": 61, "conditions": "Partly Cloudy", "humidity": 68},
-    "mumbai": {"temperature": 86, "conditions": "Humid", "humidity": 85},
-    "toronto": {"temperature": 66, "conditions": "Clear", "humidity": 58},
-    "singapore": {"temperature": 88, "conditions": "Humid", "humidity": 90},
-    "dubai": {"temperature": 95, "conditions": "Sunny", "humidity": 45},
+@dataclass(slots=True, frozen=True)
+class WeatherData:
+    """Weather conditions for a single city."""
+
+    temperature: int
+    conditions: str
+    humidity: int
+
+
+# Mock weather data for demonstration (read-only view; entries are frozen dataclasses)
+MOCK_WEATHER_DATA: Final[Mapping[str, WeatherData]] = MappingProxyType(
+    {
+        "new york": WeatherData(temperature=72, conditions="Partly Cloudy", humidity=65),
+        "london": WeatherData(temperature=59, conditions="Rainy", humidity=80),
+        "tokyo": WeatherData(temperature=68, conditions="Clear", humidity=55),
+        "paris": WeatherData(temperature=64, conditions="Cloudy", humidity=70),
+        "sydney": WeatherData(temperature=75, conditions="Sunny", humidity=60),
+        "berlin": WeatherData(temperature=61, conditions="Partly Cloudy", humidity=68),
+        "mumbai": WeatherData(temperature=86, conditions="Humid", humidity=85),
+        "toronto": WeatherData(temperature=66, conditions="Clear", humidity=58),
+        "singapore": WeatherData(temperature=88, conditions="Humid", humidity=90),
+        "dubai": WeatherData(temperature=95, conditions="Sunny", humidity=45),
+    }
+)
+
+# Ready-made results for the known cities, keyed by normalized name.
+# get_weather returns these dicts as-is, so they must never be modified.
+_WEATHER_BY_KEY: Final[dict[str, dict[str, Any]]] = {
+    key: {
+        "city": key.title(),
+        "temperature_f": weather.temperature,
+        "conditions": weather.conditions,
+        "humidity_percent": weather.humidity,
+    }
+    for key, weather in MOCK_WEATHER_DATA.items()
 }
 
+# Conditions and generator used for cities without mock data
+_CONDITIONS: Final = ("Sunny", "Cloudy", "Partly Cloudy", "Rainy", "Clear")
+_rng: Final = random.Random()  # nosec B311 - mock data, not security sensitive
+
+# 256-entry lookup tables indexed by one random byte each. 256 is not a multiple
+# of the range sizes, so the lowest values come up very slightly more often,
+# which is fine for mock data.
+_CONDITION_LUT: Final = tuple(_CONDITIONS[i % len(_CONDITIONS)] for i in range(256))
+_TEMPERATURE_LUT: Final = tuple(50 + i % 46 for i in range(256))  # 50-95 °F
+_HUMIDITY_LUT: Final = tuple(40 + i % 51 for i in range(256))  # 40-90 %
+
+
+@functools.lru_cache(maxsize=256)
+def _titlecase(
+    city: str,
+) -> str:
+    """Return the display form of a city name, cached for repeated lookups.
+
+    Args:
+        city: The city name as given by the caller
+
+    Returns:
+        Title-cased city name
+    """
+    return city.title()
 
-def _generate_random_weather() -> dict[str, Any]:
+
+def _generate_random_weather() -> WeatherData:
     """Generate random weather data for unknown cities.
 
     Returns:
-        Dictionary containing random weather information
+        Random weather information
+    """
+    # One 24-bit draw supplies a byte for each field
+    bits = _rng.getrandbits(24)
+    temperature = _TEMPERATURE_LUT[bits & 0xFF]
+    humidity = _HUMIDITY_LUT[(bits >> 8) & 0xFF]
+    conditions = _CONDITION_LUT[bits >> 16]
+
+    return WeatherData(
+        temperature=temperature,
+        conditions=conditions,
+        humidity=humidity,
+    )
+
+
+def _normalize_city(
+    city: str,
+) -> tuple[str, str]:
+    """Validate a city name and return its stripped and lookup forms.
+
+    Args:
+        city: The name of the city as given by the caller
+
+    Returns:
+        Tuple of the stripped name and the interned, lower-cased lookup key
+
+    Raises:
+        ValueError: If city name is empty or invalid
+    """
+    if type(city) is not str or not (city_stripped := city.strip()):
+        logger.error(f"Invalid city parameter: {city!r}")
+        raise ValueError("City name must be a non-empty string")
+
+    # Skip the lower() copy when the agent already sent a lower-case name
+    city_lower = city_stripped if city_stripped.islower() else city_stripped.lower()
+
+    # Interned so the known-city probe can match the (interned) literal keys by identity
+    return city_stripped, sys.intern(city_lower)
+
+
+def _lookup_weather(
+    city_stripped: str,
+    city_normalized: str,
+) -> dict[str, Any]:
+    """Return the weather result for a validated city.
+
+    Args:
+        city_stripped: The city name with surrounding whitespace removed
+        city_normalized: The lookup key from _normalize_city
+
+    Returns:
+        The shared result for a known city, or a new random result
     """
-    conditions_list = ["Sunny", "Cloudy", "Partly Cloudy", "Rainy", "Clear"]
-    temperature = random.randint(50, 95)  # nosec B311
-    humidity = random.randint(40, 90)  # nosec B311
-    conditions = random.choice(conditions_list)  # nosec B311
+    known_result = _WEATHER_BY_KEY.get(city_normalized)
+    if known_result is not None:
+        logger.debug("Found mock weather data for %s", city_normalized)
+        return known_result
 
+    weather_data = _generate_random_weather()
+    logger.debug("Generated random weather data for %s", city_normalized)
     return {
-        "temperature": temperature,
-        "conditions": conditions,
-        "humidity": humidity,
+        "city": _titlecase(city_stripped),
+        "temperature_f": weather_data.temperature,
+        "conditions": weather_data.conditions,
+        "humidity_percent": weather_data.humidity,
     }
 
 
@@ -56,38 +164,53 @@ def get_weather(
 
     Returns:
         Dictionary containing weather information with temperature,
-        conditions, and humidity
+        conditions, and humidity. Results for known cities are shared
+        between calls and must be treated as read-only.
 
     Raises:
         ValueError: If city name is empty or invalid
     """
-    if not city or not isinstance(city, str):
-        logger.error(f"Invalid city parameter: {city}")
-        raise ValueError("City name must be a non-empty string")
+    city_stripped, city_normalized = _normalize_city(city)
 
-    city_normalized = city.strip().lower()
+    # Checked once so the f-string log messages are only built when INFO is enabled
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info(f"Getting weather for city: {city_normalized}")
 
-    if not city_normalized:
-        logger.error("Empty city name after normalization")
-        raise ValueError("City name cannot be empty")
+    result = _lookup_weather(city_stripped, city_normalized)
 
-    logger.info(f"Getting weather for city: {city_normalized}")
+    if log_info:
+        logger.info(
+            f"Weather for {result['city']}: {result['temperature_f']}°F, {result['conditions']}"
+        )
 
-    # Get weather data from mock data or generate random
-    if city_normalized in MOCK_WEATHER_DATA:
-        weather_data = MOCK_WEATHER_DATA[city_normalized]
-        logger.debug(f"Found mock weather data for {city_normalized}")
-    else:
-        weather_data = _generate_random_weather()
-        logger.debug(f"Generated random weather data for {city_normalized}")
+    return result
 
-    result = {
-        "city": city.title(),
-        "temperature_f": weather_data["temperature"],
-        "conditions": weather_data["conditions"],
-        "humidity_percent": weather_data["humidity"],
-    }
 
-    logger.info(f"Weather for {city.title()}: {result['temperature_f']}°F, {result['conditions']}")
+def get_weather_many(
+    cities: list[str],
+) -> list[dict[str, Any]]:
+    """Get current weather information for several cities in one call.
 
-    return result
+    All names are validated before any lookup, so an invalid entry fails the
+    whole batch without generating partial results.
+
+    Args:
+        cities: The names of the cities to get weather for
+
+    Returns:
+        List of weather dictionaries in the same order as ``cities``, in the
+        same format (and with the same read-only sharing) as get_weather
+
+    Raises:
+        ValueError: If any city name is empty or invalid
+    """
+    normalized = [_normalize_city(city) for city in cities]
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Getting weather for {len(normalized)} cities")
+
+    return [
+        _lookup_weather(city_stripped, city_normalized)
+        for city_stripped, city_normalized in normalized
+    ]